@@ -0,0 +1,208 @@
+import re
+from itertools import starmap
+from operator import itemgetter
+from typing import List, Tuple, Dict, Any
+
+import pymupdf
+
+
+# Cabeçalho flexível (aceita espaços e quebras de linha)
+HEADER_RE = re.compile(r"PRODUTO\s+UNIDADES", re.IGNORECASE)
+
+# UNIDADES no texto após o cabeçalho, uma linha por ocorrência:
+#   - many: linha só com números (ex.: "3 2 360")
+#   - one: linha que começa com número e depois vem texto (ex.: "12 • Embale ...")
+UNITS_LINE_RE = re.compile(
+    r"^[^\S\n]*(?:(?P<many>\d{1,4}(?:[^\S\n]+\d{1,4})+)[^\S\n]*$|(?P<one>\d{1,4})\b)",
+    re.MULTILINE,
+)
+
+def page_words(page) -> list[dict]:
+    """
+    Palavras da página no mesmo formato do pdfplumber (x0, x1, top, bottom, text),
+    com as coordenadas já em float.
+    O PyMuPDF devolve tuplas (x0, y0, x1, y1, palavra, bloco, linha, n_palavra).
+    """
+    return [
+        {"x0": x0, "x1": x1, "top": y0, "bottom": y1, "text": text}
+        for x0, y0, x1, y1, text, *_ in page.get_text("words")
+    ]
+
+def extract_skus_from_words(words: list[dict]) -> list[str]:
+    """
+    Extrai SKUs na ordem visual da página a partir das palavras (page_words).
+    Regra: após 'SKU' ou 'SKU:' pegar o próximo token que contenha letra+numero.
+    Se vier 'SKU: 3', ignora '3' e continua até achar 'CX81X20'.
+    """
+    if not words:
+        return []
+
+    # Ordena de cima pra baixo, esquerda pra direita (ordem do documento);
+    # numa cópia, porque a mesma lista vai para extract_units_by_column
+    words = sorted(words, key=itemgetter("top", "x0"))
+
+    skus = []
+    pending = False
+    lookahead = 0
+
+    for w in words:
+        t = (w.get("text") or "").strip()
+        if not t:
+            continue
+
+        # Detecta o marcador SKU ('SKU', 'SKU:' ou 'SKU:...'); basta olhar o prefixo
+        head = t[:4].upper()
+        if head == "SKU" or head == "SKU:":
+            pending = True
+            lookahead = 0
+            continue
+
+        if pending:
+            lookahead += 1
+
+            # para não “viajar” demais (caso não encontre SKU perto)
+            if lookahead > 20:
+                pending = False
+                continue
+
+            # ignora tokens numéricos (são as UNIDADES ou outros números)
+            if t.isdigit():
+                continue
+
+            # aceita somente SKU com letra+numero: alfanumérico ASCII que não é
+            # só letras (só números já foi descartado acima)
+            if t.isascii() and t.isalnum() and not t.isalpha():
+                skus.append(t)
+                pending = False
+
+    return skus
+
+def extract_units_from_tail(page_text: str) -> List[int]:
+    """
+    Pega UNIDADES do bloco após o cabeçalho 'PRODUTO UNIDADES' (flexível).
+    Extrai números na ordem:
+      - linhas com vários números: '3 2 360'
+      - linhas começando com número: '12 • Embale ...'
+    """
+    if not page_text:
+        return []
+
+    # pega a ÚLTIMA ocorrência na página (mais seguro)
+    last = None
+    for last in HEADER_RE.finditer(page_text):
+        pass
+    if last is None:
+        return []
+
+    tail = page_text[last.start():]
+
+    # uma única varredura da cauda, sem quebrar em linhas
+    units: List[int] = []
+    for m in UNITS_LINE_RE.finditer(tail):
+        many = m.group("many")
+        if many:
+            units.extend(map(int, many.split()))
+        else:
+            units.append(int(m.group("one")))
+
+    return units
+
+def extract_units_by_column(words: list[dict]) -> list[int]:
+    """
+    Pega UNIDADES usando coordenadas: encontra o cabeçalho 'UNIDADES' e coleta
+    números (1–4 dígitos) na mesma faixa X abaixo do cabeçalho, ordenados por Y.
+    """
+    if not words:
+        return []
+
+    # acha a palavra UNIDADES no cabeçalho
+    header = None
+    for w in words:
+        if (w.get("text") or "").strip().upper() == "UNIDADES":
+            header = w
+            break
+    if header is None:
+        return []
+
+    x0 = header["x0"]
+    x1 = header["x1"]
+    header_bottom = header["bottom"]
+
+    # tolerância para pegar números alinhados na coluna (varia conforme fonte/layout)
+    pad_left = 25.0
+    pad_right = 40.0
+    xmin = x0 - pad_left
+    xmax = x1 + pad_right
+
+    candidates = []
+    for w in words:
+        t = (w.get("text") or "").strip()
+        if not t.isdigit():
+            continue
+        if len(t) > 4:
+            continue
+
+        wx0 = w["x0"]
+        wx1 = w["x1"]
+        wtop = w["top"]
+        wbottom = w["bottom"]
+
+        # abaixo do cabeçalho e dentro da faixa X da coluna
+        if wbottom > header_bottom and wx0 >= xmin and wx1 <= xmax:
+            candidates.append((wtop, wx0, int(t)))
+
+    # ordena na ordem visual (de cima pra baixo)
+    candidates.sort(key=itemgetter(0, 1))
+    return [u for _, __, u in candidates]
+
+def parse_page_range(doc, lo: int, hi: int) -> Tuple[List[List[str]], List[List[int]]]:
+    """
+    Processa as páginas [lo, hi) do documento já aberto.
+    Devolve duas listas paralelas (SKUs e UNIDADES de cada página, em ordem).
+    """
+    page_skus: List[List[str]] = []
+    page_units: List[List[int]] = []
+
+    for page_idx in range(lo, hi):
+        page = doc[page_idx]
+
+        # as palavras são extraídas uma vez só e servem para SKU e UNIDADES
+        words = page_words(page)
+        skus = extract_skus_from_words(words)
+        units = extract_units_by_column(words)
+        if not units:
+        # fallback pro método antigo se por algum motivo não achar a coluna;
+        # só aqui vale a pena extrair o texto corrido da página
+            units = extract_units_from_tail(page.get_text("text", sort=True))
+
+        page_skus.append(skus)
+        page_units.append(units)
+
+    return page_skus, page_units
+
+def pdf_to_pairs(file_bytes: bytes) -> Tuple[List[Tuple[str, int]], Dict[str, Any]]:
+    pairs: List[Tuple[str, int]] = []
+    diag: Dict[str, Any] = {"pages": 0, "per_page": []}
+
+    # ~1 ms por página em sequência; um pool de processos não compensa aqui:
+    # sob o `streamlit run` cada processo filho reexecuta o app.py
+    with pymupdf.open(stream=file_bytes, filetype="pdf") as doc:
+        diag["pages"] = doc.page_count
+        page_skus, page_units = parse_page_range(doc, 0, doc.page_count)
+
+    for page_idx, (skus, units) in enumerate(zip(page_skus, page_units), start=1):
+        # zip para no menor dos dois, como o min() abaixo
+        pairs.extend(zip(skus, units))
+        paired = min(len(skus), len(units))
+
+        diag["per_page"].append(
+            {"page": page_idx, "skus": len(skus), "units": len(units), "paired": paired}
+        )
+
+    return pairs, diag
+
+
+def pairs_to_markdown(pairs: List[Tuple[str, int]]) -> str:
+    lines = ["| SKU | UNIDADES |", "|---|---:|"]
+    lines.extend(starmap("| {} | {} |".format, pairs))
+    return "\n".join(lines)
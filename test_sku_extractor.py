@@ -0,0 +1,144 @@
+import random
+import re
+
+import pymupdf
+
+import sku_extractor
+
+
+# PDF de /Count 0: válido, mas sem páginas (o PyMuPDF não salva um desses)
+EMPTY_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[]/Count 0>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+def add_column_page(doc, rows):
+    """Página com a coluna UNIDADES: descrição, 'SKU: ...' e o número à direita."""
+    page = doc.new_page()
+    page.insert_text((50, 100), "PRODUTO", fontsize=10)
+    page.insert_text((420, 100), "UNIDADES", fontsize=10)
+    y = 130
+    for sku, units in rows:
+        page.insert_text((50, y), "Caixa de papelao", fontsize=9)
+        page.insert_text((50, y + 12), f"SKU: {sku}", fontsize=9)
+        page.insert_text((430, y + 6), str(units), fontsize=9)
+        y += 40
+
+
+def add_tail_page(doc, skus, lines):
+    """Página sem coluna detectável: as UNIDADES vêm do texto após o cabeçalho."""
+    page = doc.new_page()
+    y = 60
+    for i, sku in enumerate(skus):
+        page.insert_text((50, y), f"Item {i} SKU: 3", fontsize=9)
+        page.insert_text((50, y + 12), sku, fontsize=9)
+        y += 30
+    page.insert_text((50, y + 10), "produto  unidades", fontsize=10)
+    y += 30
+    for line in lines:
+        page.insert_text((300, y), line, fontsize=9)
+        y += 14
+
+
+def build_sample():
+    rnd = random.Random(7)
+    doc = pymupdf.open()
+    expected = []
+    for p in range(12):
+        if p % 4 == 3:
+            skus = [f"CX{p}A{i}" for i in range(5)]
+            add_tail_page(doc, skus, ["3 2 360", "12 Embale em caixa", "99999 ignorar", "45 - fim"])
+            expected.extend(zip(skus, [3, 2, 360, 12, 45]))
+        else:
+            rows = [(f"CX{rnd.randint(1, 99)}X{p}{i}", rnd.randint(1, 400)) for i in range(10)]
+            add_column_page(doc, rows)
+            expected.extend(rows)
+    return doc.tobytes(), expected
+
+
+def test_pdf_to_pairs_multi_page():
+    file_bytes, expected = build_sample()
+    pairs, diag = sku_extractor.pdf_to_pairs(file_bytes)
+
+    assert pairs == expected
+    assert diag["pages"] == 12
+    assert all(d["skus"] == d["units"] == d["paired"] for d in diag["per_page"])
+
+
+def test_pdf_to_pairs_matches_page_ranges():
+    file_bytes, _ = build_sample()
+    pairs, _ = sku_extractor.pdf_to_pairs(file_bytes)
+
+    with pymupdf.open(stream=file_bytes, filetype="pdf") as doc:
+        whole = sku_extractor.parse_page_range(doc, 0, doc.page_count)
+        # processar em faixas dá o mesmo resultado que o documento inteiro
+        skus, units = [], []
+        for lo in range(0, doc.page_count, 5):
+            s, u = sku_extractor.parse_page_range(doc, lo, min(lo + 5, doc.page_count))
+            skus.extend(s)
+            units.extend(u)
+
+    assert (skus, units) == whole
+    assert pairs == [p for s, u in zip(*whole) for p in zip(s, u)]
+
+
+def test_pdf_to_pairs_no_pages():
+    assert sku_extractor.pdf_to_pairs(EMPTY_PDF) == ([], {"pages": 0, "per_page": []})
+
+
+def units_from_tail_reference(page_text):
+    # implementação original (linha a linha), usada como referência
+    matches = list(sku_extractor.HEADER_RE.finditer(page_text))
+    if not matches:
+        return []
+    units = []
+    for line in page_text[matches[-1].start():].splitlines():
+        s = line.strip()
+        if not s:
+            continue
+        if re.fullmatch(r"(?:\d{1,4}\s+)+\d{1,4}", s):
+            units.extend([int(x) for x in s.split()])
+            continue
+        m = re.match(r"^(\d{1,4})\b", s)
+        if m:
+            units.append(int(m.group(1)))
+    return units
+
+
+def test_units_from_tail_matches_line_by_line():
+    rnd = random.Random(0)
+    toks = ["1", "12", "360", "9999", "12345", "abc", "•", "Embale", " ", "\t", "-", "PRODUTO UNIDADES", "x1"]
+    for _ in range(3000):
+        lines = [
+            "".join(rnd.choice(toks) + rnd.choice([" ", "", "  "]) for _ in range(rnd.randint(0, 5)))
+            for _ in range(rnd.randint(0, 8))
+        ]
+        text = rnd.choice(["", "PRODUTO UNIDADES\n", "produto\nunidades\n"]) + "\n".join(lines)
+        assert sku_extractor.extract_units_from_tail(text) == units_from_tail_reference(text), repr(text)
+
+
+def test_sku_marker_and_token_rules():
+    # regras originais: marcador via upper() completo, token via regex com lookaheads
+    token_re = re.compile(r"^(?=.*[A-Za-z])(?=.*\d)[A-Za-z0-9]+$")
+    rnd = random.Random(1)
+    alphabet = "SKUsku:ſx19 ßÁ٣-"
+    for _ in range(3000):
+        marker = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 5)))
+        token = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 6)))
+        if not marker.strip() or not token.strip() or " " in marker + token:
+            continue
+        words = [
+            {"x0": 10.0, "x1": 20.0, "top": 10.0, "bottom": 20.0, "text": marker},
+            {"x0": 30.0, "x1": 40.0, "top": 10.0, "bottom": 20.0, "text": token},
+        ]
+        upper = marker.upper()
+        is_marker = upper in ("SKU", "SKU:") or upper.startswith("SKU:")
+        expected = [token] if is_marker and not token.isdigit() and token_re.match(token) else []
+        assert sku_extractor.extract_skus_from_words(words) == expected, (marker, token)
+
+
+def test_pairs_to_markdown():
+    assert sku_extractor.pairs_to_markdown([]) == "| SKU | UNIDADES |\n|---|---:|"
+    assert sku_extractor.pairs_to_markdown([("CX1A", 3)]).endswith("\n| CX1A | 3 |")